@@ -0,0 +1,12 @@
+"""
+Configuración de Celery para tareas en segundo plano (envío de correos, etc.).
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+
+app = Celery('app')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
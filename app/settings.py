@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
@@ -71,6 +72,40 @@ EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'webmaster@localhost')
 
+# Caché (PDF de certificados renderizados, etc.)
+# Con REDIS_URL se comparte entre workers; sin ella se usa memoria local.
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# ETag de la lista de eventos: usa una versión guardada en caché, que solo es
+# coherente entre procesos/instancias si la caché es compartida (Redis).
+EVENT_LIST_ETAG = bool(REDIS_URL)
+
+# Procesos dedicados a renderizar PDFs de certificados (0 = en el mismo proceso).
+CERTIFICATE_PDF_WORKERS = int(os.environ.get('CERTIFICATE_PDF_WORKERS', 0))
+# Segundos máximos de espera por un PDF renderizado en el pool.
+CERTIFICATE_PDF_TIMEOUT = float(os.environ.get('CERTIFICATE_PDF_TIMEOUT', 30))
+
+# Celery (tareas en segundo plano). Solo se usa un broker si se configura
+# explícitamente (requiere además un worker corriendo); sin él las tareas se
+# ejecutan en el mismo proceso y sus errores se propagan al llamador.
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL')
+CELERY_TASK_ALWAYS_EAGER = not CELERY_BROKER_URL
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TASK_IGNORE_RESULT = True
+
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -159,6 +194,10 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Hasher rápido solo para la suite de tests (manage.py test); producción no se ve afectada
+if len(sys.argv) > 1 and sys.argv[1] == 'test':
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
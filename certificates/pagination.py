@@ -0,0 +1,44 @@
+"""
+Paginación para la API de certificados.
+"""
+from functools import cached_property, partial
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from rest_framework.pagination import PageNumberPagination
+
+# Segundos que se reutiliza el total de certificados de un usuario.
+COUNT_CACHE_TIMEOUT = 60
+
+
+def certificate_count_cache_key(user_id) -> str:
+    return f'cert:count:{user_id}'
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator que obtiene el total (COUNT) desde la caché si tiene clave."""
+
+    def __init__(self, *args, cache_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_key = cache_key
+
+    @cached_property
+    def count(self):
+        if self.cache_key is None:
+            return super().count
+        return cache.get_or_set(
+            self.cache_key, self.object_list.count, COUNT_CACHE_TIMEOUT
+        )
+
+
+class CertificatePagination(PageNumberPagination):
+    """Paginación por número de página con el total cacheado por usuario."""
+
+    page_size = 50
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = partial(
+            CachedCountPaginator,
+            cache_key=certificate_count_cache_key(request.user.id),
+        )
+        return super().paginate_queryset(queryset, request, view)
@@ -9,7 +9,7 @@ from core.models import Certificate
 class CertificateSerializer(serializers.ModelSerializer):
     """Serializer para el modelo Certificate."""
 
-    user = serializers.StringRelatedField(read_only=True)
+    user = serializers.CharField(source='user.email', read_only=True)
 
     class Meta:
         model = Certificate
@@ -20,8 +20,24 @@ class CertificateSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user', 'created_at']
 
 
+class CertificateListSerializer(CertificateSerializer):
+    """Serializer liviano para listar certificados (sin descripción ni PDF)."""
+
+    class Meta(CertificateSerializer.Meta):
+        fields = [
+            'id', 'title', 'issued_at', 'expires_at', 'status', 'user',
+            'created_at',
+        ]
+
+
 class CertificateDetailSerializer(CertificateSerializer):
     """Serializer detallado para certificados (extensible)."""
 
     class Meta(CertificateSerializer.Meta):
         fields = CertificateSerializer.Meta.fields
+
+
+class SendEmailSerializer(serializers.Serializer):
+    """Serializer para el destinatario de un certificado enviado por email."""
+
+    email = serializers.EmailField()
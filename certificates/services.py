@@ -5,23 +5,151 @@ Implementación on-demand: no se almacena el PDF en disco ni en FileField.
 Nota: Evitamos importar WeasyPrint a nivel de módulo para que `manage.py check`
 pueda ejecutarse incluso si faltan dependencias nativas en el entorno.
 """
-from django.template.loader import render_to_string
-from django.core.mail import EmailMessage
+import functools
+import hashlib
+import html
+import string
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from types import SimpleNamespace
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.units import mm
+    _REPORTLAB_OK = True
+    # Coordenadas fijas de la página del certificado (ReportLab).
+    _PAGE_WIDTH, _PAGE_HEIGHT = A4
+    _TITLE_Y = _PAGE_HEIGHT - 30 * mm
+    _BODY_X = 25 * mm
+    _BODY_Y = _PAGE_HEIGHT - 50 * mm
+    _LINE_LEADING = 8 * mm
+    _FOOTER_Y = 20 * mm
+except ImportError:
+    _REPORTLAB_OK = False
+
+# Tiempo de vida (segundos) del PDF renderizado en caché.
+PDF_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# Pool de procesos para renderizar PDFs (ver `_get_pdf_pool`).
+_PDF_POOL = None
+
+# Clase `HTML` de WeasyPrint (o la excepción de importación), resuelta una vez.
+_WEASY = None
+
+
+def _get_weasyprint():
+    """Retornar la clase `HTML` de WeasyPrint, importándola una sola vez.
+
+    Si la importación falla (p. ej. faltan GTK/Pango) se recuerda el error para
+    no volver a recorrer el sistema de imports en cada petición.
+    """
+    global _WEASY
+    if _WEASY is None:
+        try:
+            from weasyprint import HTML  # type: ignore
+            _WEASY = HTML
+        except Exception as exc:
+            _WEASY = exc
+    if isinstance(_WEASY, Exception):
+        raise RuntimeError('WeasyPrint no está disponible.') from _WEASY
+    return _WEASY
+
+
+def _get_pdf_pool():
+    """Retornar el pool de procesos para renderizar PDFs (None si no hay).
+
+    Se crea al primer uso según `settings.CERTIFICATE_PDF_WORKERS`.
+    """
+    global _PDF_POOL
+    workers = getattr(settings, 'CERTIFICATE_PDF_WORKERS', 0)
+    if not workers:
+        return None
+    if _PDF_POOL is None:
+        _PDF_POOL = ProcessPoolExecutor(
+            max_workers=workers, initializer=django.setup
+        )
+    return _PDF_POOL
+
+
+def _discard_pdf_pool(pool) -> None:
+    """Descartar un pool roto para que el siguiente uso cree uno nuevo."""
+    global _PDF_POOL
+    if _PDF_POOL is pool:
+        _PDF_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _certificate_data(certificate) -> dict:
+    """Extraer (serializables) los campos que usan las plantillas del PDF."""
+    return {
+        'id': certificate.id,
+        'title': certificate.title,
+        'description': certificate.description,
+        'issued_at': certificate.issued_at,
+        'expires_at': certificate.expires_at,
+        'status': certificate.status,
+        'user': {
+            'name': certificate.user.name,
+            'email': certificate.user.email,
+        },
+    }
+
+
+def _render_pdf_from_data(data: dict) -> tuple[bytes, str]:
+    """Punto de entrada en el proceso hijo: reconstruye el certificado."""
+    certificate = SimpleNamespace(
+        **{**data, 'user': SimpleNamespace(**data['user'])}
+    )
+    return _render_pdf(certificate)
 
 
 def generate_certificate_pdf_bytes(certificate) -> tuple[bytes, str]:
     """Generar un PDF en memoria para un Certificate.
 
-    Retorna una tupla (pdf_bytes, file_name). No escribe en disco.
+    Retorna una tupla (pdf_bytes, file_name). No escribe en disco. Si
+    `CERTIFICATE_PDF_WORKERS` > 0 el render se hace en un proceso aparte para
+    no bloquear (GIL) al worker que atiende el request.
+
+    Si un proceso hijo muere (p. ej. OOM) el pool queda inutilizable: se
+    descarta y este PDF se renderiza en el proceso actual. Si el render supera
+    `CERTIFICATE_PDF_TIMEOUT` se propaga `TimeoutError`.
     """
+    pool = _get_pdf_pool()
+    if pool is None:
+        return _render_pdf(certificate)
+    try:
+        future = pool.submit(
+            _render_pdf_from_data, _certificate_data(certificate)
+        )
+        try:
+            return future.result(timeout=settings.CERTIFICATE_PDF_TIMEOUT)
+        except TimeoutError:
+            future.cancel()
+            raise
+    except BrokenProcessPool:
+        _discard_pdf_pool(pool)
+        return _render_pdf(certificate)
+
+
+def _render_pdf(certificate) -> tuple[bytes, str]:
     context = {'cert': certificate}
     # Intento 1: WeasyPrint (HTML → PDF). Importación perezosa.
     try:
-        from weasyprint import HTML  # type: ignore
+        HTML = _get_weasyprint()
+        template = _get_template('certificates/certificate_pdf.html')
         html_content = (
-            render_to_string('certificates/certificate_pdf.html', context)
-            if template_exists('certificates/certificate_pdf.html')
-            else _fallback_html(context)
+            template.render(context) if template else _fallback_html(context)
         )
         pdf_bytes: bytes = HTML(string=html_content).write_pdf()
         file_name = f'certificate_{certificate.id or "temp"}.pdf'
@@ -31,54 +159,102 @@ def generate_certificate_pdf_bytes(certificate) -> tuple[bytes, str]:
         return _generate_pdf_reportlab(certificate)
 
 
-def template_exists(template_name: str) -> bool:
-    from django.template import engines
-    django_engine = engines['django']
+def _pdf_cache_key(certificate) -> str:
+    # El PDF imprime datos del usuario, que no tocan `updated_at`.
+    version = certificate.updated_at or certificate.issued_at
+    owner = hashlib.md5(
+        f'{certificate.user.name}\0{certificate.user.email}'.encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return (
+        f'cert:pdf:{certificate.pk}:{version.isoformat()}'
+        f':{certificate.status}:{owner}'
+    )
+
+
+def get_certificate_pdf_bytes(certificate) -> tuple[bytes, str]:
+    """Igual que `generate_certificate_pdf_bytes`, con el PDF en caché.
+
+    La clave incluye `updated_at` y los datos impresos del usuario, por lo que
+    editar el certificado o renombrar al usuario invalida el PDF anterior.
+    """
+    if certificate.pk is None:
+        return generate_certificate_pdf_bytes(certificate)
+
+    key = _pdf_cache_key(certificate)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = generate_certificate_pdf_bytes(certificate)
+    cache.set(key, result, PDF_CACHE_TIMEOUT)
+    return result
+
+
+@functools.lru_cache(maxsize=8)
+def _get_template(template_name: str):
+    """Retornar la plantilla compilada (o None si no existe), una sola vez."""
     try:
-        django_engine.get_template(template_name)
-        return True
-    except Exception:
-        return False
+        return get_template(template_name)
+    except TemplateDoesNotExist:
+        return None
 
 
-def _fallback_html(ctx: dict) -> str:
-    cert = ctx['cert']
-    return f"""
+_FALLBACK_TMPL = string.Template("""
     <html><head><meta charset='utf-8'><style>
-    body {{ font-family: Arial, sans-serif; margin:40px; }}
-    .box {{ border:2px solid #444; padding:30px; border-radius:12px; }}
-    h1 {{ text-align:center; margin-bottom:10px; }}
-    .meta {{ font-size:12px; color:#666; margin-top:30px; }}
+    body { font-family: Arial, sans-serif; margin:40px; }
+    .box { border:2px solid #444; padding:30px; border-radius:12px; }
+    h1 { text-align:center; margin-bottom:10px; }
+    .meta { font-size:12px; color:#666; margin-top:30px; }
     </style></head><body>
       <div class='box'>
         <h1>Certificado de Residencia</h1>
-        <p>Se certifica que <strong>{cert.user.name}</strong> mantiene registro de residencia en el sistema BarrioLink.</p>
-        <p>Título: <em>{cert.title}</em></p>
-        <p>Emitido el: {cert.issued_at}</p>
-        {f"<p>Válido hasta: {cert.expires_at}</p>" if cert.expires_at else ''}
-        <p>Estado: {cert.status}</p>
+        <p>Se certifica que <strong>${name}</strong> mantiene registro de
+        residencia en el sistema BarrioLink.</p>
+        <p>Título: <em>${title}</em></p>
+        <p>Emitido el: ${issued_at}</p>
+        ${expires}
+        <p>Estado: ${status}</p>
         <div class='meta'>Generado automáticamente por BarrioLink.</div>
       </div>
     </body></html>
-    """
+    """)
 
 
-def send_certificate_email(certificate, to_email: str):
-    """Enviar el certificado por correo generándolo en memoria (sin guardar)."""
-    from django.utils import timezone
+def _fallback_html(ctx: dict) -> str:
+    cert = ctx['cert']
+    expires = (
+        f'<p>Válido hasta: {html.escape(str(cert.expires_at))}</p>'
+        if cert.expires_at else ''
+    )
+    return _FALLBACK_TMPL.substitute(
+        name=html.escape(cert.user.name),
+        title=html.escape(cert.title),
+        issued_at=html.escape(str(cert.issued_at)),
+        expires=expires,
+        status=html.escape(cert.status),
+    )
+
+
+def send_certificate_email(certificate, to_email: str, connection=None):
+    """Enviar el certificado por correo generándolo en memoria (sin guardar).
 
-    pdf_bytes, file_name = generate_certificate_pdf_bytes(certificate)
+    `connection` permite reutilizar una conexión SMTP ya abierta; si se omite,
+    Django abre una nueva para este único mensaje.
+    """
+    pdf_bytes, file_name = get_certificate_pdf_bytes(certificate)
 
     context = {
         'cert': certificate,
-        'now': timezone.now()
+        'now': timezone.localdate(),
     }
 
     subject = f"Certificado: {certificate.title}"
 
     # Intenta usar el template HTML para el email
-    if template_exists('certificates/email_certificate.html'):
-        html_body = render_to_string('certificates/email_certificate.html', context)
+    template = _get_template('certificates/email_certificate.html')
+    if template:
+        html_body = template.render(context)
         email = EmailMessage(subject, html_body, to=[to_email])
         email.content_subtype = 'html'  # Importante: indica que el cuerpo es HTML
     else:
@@ -87,7 +263,21 @@ def send_certificate_email(certificate, to_email: str):
         email = EmailMessage(subject, body, to=[to_email])
 
     email.attach(file_name, pdf_bytes, 'application/pdf')
-    email.send(fail_silently=False)
+    connection = connection or get_connection()
+    connection.send_messages([email])
+
+
+def send_certificate_emails_batch(pairs):
+    """Enviar varios certificados usando una única conexión SMTP.
+
+    `pairs` es un iterable de tuplas (certificate, to_email). El handshake
+    TLS/AUTH se paga una sola vez para todo el lote.
+    """
+    with get_connection() as connection:
+        for certificate, to_email in pairs:
+            send_certificate_email(
+                certificate, to_email, connection=connection
+            )
 
 
 def _generate_pdf_reportlab(certificate) -> tuple[bytes, str]:
@@ -95,53 +285,43 @@ def _generate_pdf_reportlab(certificate) -> tuple[bytes, str]:
 
     Útil en Windows cuando faltan dependencias nativas de WeasyPrint.
     """
-    try:
-        from io import BytesIO
-        from reportlab.lib.pagesizes import A4
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.units import mm
-        import textwrap
-    except Exception as exc:
+    if not _REPORTLAB_OK:
         raise RuntimeError(
             'No se pudo usar WeasyPrint ni ReportLab. Instala dependencias de WeasyPrint '
             'o ejecuta: pip install reportlab'
-        ) from exc
+        )
 
     buffer = BytesIO()
     c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
 
     title = 'Certificado de Residencia'
     c.setTitle(title)
 
     # Encabezado
     c.setFont('Helvetica-Bold', 20)
-    c.drawCentredString(width/2, height - 30*mm, title)
-
-    # Contenido
-    c.setFont('Helvetica', 12)
-    y = height - 50*mm
-    lines = [
-        f"Nombre: {getattr(certificate.user, 'name', certificate.user.email)}",
-        f"Título: {certificate.title}",
-        f"Emitido el: {certificate.issued_at}",
-    ]
+    c.drawCentredString(_PAGE_WIDTH / 2, _TITLE_Y, title)
+
+    # Contenido: un único objeto de texto en lugar de un drawString por línea
+    text = c.beginText(_BODY_X, _BODY_Y)
+    text.setFont('Helvetica', 12, leading=_LINE_LEADING)
+    name = getattr(certificate.user, 'name', certificate.user.email)
+    text.textLine(f"Nombre: {name}")
+    text.textLine(f"Título: {certificate.title}")
+    text.textLine(f"Emitido el: {certificate.issued_at}")
     if certificate.expires_at:
-        lines.append(f"Válido hasta: {certificate.expires_at}")
-    lines.append(f"Estado: {certificate.status}")
+        text.textLine(f"Válido hasta: {certificate.expires_at}")
+    text.textLine(f"Estado: {certificate.status}")
     if certificate.description:
-        lines.append("")
-        lines.append("Descripción:")
-        desc_lines = textwrap.wrap(certificate.description, width=90)
-        lines.extend(desc_lines)
-
-    for line in lines:
-        c.drawString(25*mm, y, line)
-        y -= 8*mm
+        text.textLine("")
+        text.textLine("Descripción:")
+        text.textLines(textwrap.wrap(certificate.description, width=90))
+    c.drawText(text)
 
     # Pie de página
     c.setFont('Helvetica-Oblique', 10)
-    c.drawCentredString(width/2, 20*mm, 'Generado automáticamente por BarrioLink')
+    c.drawCentredString(
+        _PAGE_WIDTH / 2, _FOOTER_Y, 'Generado automáticamente por BarrioLink'
+    )
 
     c.showPage()
     c.save()
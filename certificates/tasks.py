@@ -0,0 +1,30 @@
+"""Tareas en segundo plano para certificados."""
+from celery import shared_task
+
+from core.models import Certificate
+from .services import send_certificate_emails_batch
+
+
+@shared_task
+def send_certificate_email_task(certificate_id: int, to_email: str):
+    """Generar y enviar por correo el PDF de un certificado."""
+    try:
+        certificate = Certificate.objects.select_related('user').get(
+            pk=certificate_id
+        )
+    except Certificate.DoesNotExist:
+        return
+    send_certificate_emails_batch([(certificate, to_email)])
+
+
+@shared_task
+def send_certificate_emails_batch_task(items):
+    """Enviar [(certificate_id, to_email), ...] usando una sola conexión."""
+    certificates = Certificate.objects.select_related('user').in_bulk(
+        [certificate_id for certificate_id, _ in items]
+    )
+    send_certificate_emails_batch(
+        (certificates[certificate_id], to_email)
+        for certificate_id, to_email in items
+        if certificate_id in certificates
+    )
@@ -0,0 +1,419 @@
+"""
+Tests para la API de certificados.
+"""
+import os
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Certificate
+
+from certificates import services
+from certificates.views import BULK_REQUEST_MAX_ITEMS
+from certificates.tasks import send_certificate_emails_batch_task
+
+
+CERTIFICATES_URL = reverse('certificates:certificate-list')
+BULK_REQUEST_URL = reverse('certificates:certificate-bulk-request')
+
+
+def pdf_url(certificate_id):
+    """Crear y retornar la URL del PDF del certificado."""
+    return reverse('certificates:certificate-pdf', args=[certificate_id])
+
+
+def _render_reporting_pid(data):
+    """Reemplazo de `_render_pdf_from_data` que reporta el PID del render."""
+    return f'%PDF-{os.getpid()}'.encode(), 'certificate.pdf'
+
+
+def send_email_url(certificate_id):
+    """Crear y retornar la URL de envío por email del certificado."""
+    return reverse(
+        'certificates:certificate-send-email', args=[certificate_id]
+    )
+
+
+def create_certificate(user, **params):
+    """Crear y retornar un certificado de prueba."""
+    defaults = {
+        'title': 'Certificado de prueba',
+        'description': 'Descripción del certificado de prueba',
+        'issued_at': '2025-01-15',
+    }
+    defaults.update(params)
+    return Certificate.objects.create(user=user, **defaults)
+
+
+class PrivateCertificateApiTests(TestCase):
+    """Pruebas de API de certificados privadas (autenticadas)."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass',
+            name='Usuario Prueba',
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_certificates_limited_to_user(self):
+        """Prueba que la lista solo incluye los certificados del usuario."""
+        other_user = get_user_model().objects.create_user(
+            email='other@example.com',
+            password='testpass',
+        )
+        create_certificate(user=other_user)
+        create_certificate(user=self.user)
+        create_certificate(user=self.user, title='Otro certificado')
+
+        res = self.client.get(CERTIFICATES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['count'], 2)
+        results = res.data['results']
+        self.assertEqual({c['user'] for c in results}, {self.user.email})
+        self.assertNotIn('description', results[0])
+
+    def test_list_count_is_cached_and_invalidated(self):
+        """Prueba que el total paginado se cachea y se invalida al crear."""
+        create_certificate(user=self.user)
+        self.client.get(CERTIFICATES_URL)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(CERTIFICATES_URL)
+        self.assertEqual(res.data['count'], 1)
+
+        payload = {'title': 'Nuevo certificado', 'issued_at': '2025-02-01'}
+        self.client.post(CERTIFICATES_URL, payload)
+        res = self.client.get(CERTIFICATES_URL)
+
+        self.assertEqual(res.data['count'], 2)
+
+    def test_bulk_request_creates_certificates(self):
+        """Prueba crear varios certificados en una sola petición."""
+        payload = [
+            {'title': 'Certificado 1', 'issued_at': '2025-03-01'},
+            {'title': 'Certificado 2', 'issued_at': '2025-03-02'},
+        ]
+
+        res = self.client.post(BULK_REQUEST_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 2)
+        certificates = Certificate.objects.filter(user=self.user)
+        self.assertEqual(
+            set(certificates.values_list('title', flat=True)),
+            {'Certificado 1', 'Certificado 2'},
+        )
+
+    def test_bulk_request_rejects_invalid_items(self):
+        """Prueba que un elemento inválido impide crear el lote completo."""
+        payload = [
+            {'title': 'Certificado 1', 'issued_at': '2025-03-01'},
+            {'title': 'Sin fecha'},
+        ]
+
+        res = self.client.post(BULK_REQUEST_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Certificate.objects.filter(user=self.user).exists())
+
+    def test_bulk_request_rejects_oversized_payload(self):
+        """Prueba que un lote mayor al máximo se rechaza sin crear nada."""
+        payload = [
+            {'title': f'Certificado {i}', 'issued_at': '2025-03-01'}
+            for i in range(BULK_REQUEST_MAX_ITEMS + 1)
+        ]
+
+        res = self.client.post(BULK_REQUEST_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Certificate.objects.filter(user=self.user).exists())
+
+    def test_options_does_not_query_certificates(self):
+        """Prueba que un OPTIONS (preflight/metadata) no consulta la BD."""
+        create_certificate(user=self.user)
+
+        with self.assertNumQueries(0):
+            res = self.client.options(CERTIFICATES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_head_matches_get_status(self):
+        """Prueba que HEAD responde igual que GET: 404 si es ajeno."""
+        certificate = create_certificate(user=self.user)
+        other_user = get_user_model().objects.create_user(
+            email='other-head@example.com', password='testpass'
+        )
+        other_certificate = create_certificate(user=other_user)
+        url = reverse('certificates:certificate-detail', args=[certificate.id])
+        other_url = reverse(
+            'certificates:certificate-detail', args=[other_certificate.id]
+        )
+
+        self.assertEqual(self.client.head(url).status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.client.head(other_url).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+    def test_pdf_returns_pdf(self):
+        """Prueba que el endpoint de PDF retorna un documento PDF."""
+        certificate = create_certificate(user=self.user)
+
+        res = self.client.get(pdf_url(certificate.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/pdf')
+        self.assertTrue(res['Content-Disposition'].startswith('inline'))
+        self.assertTrue(res.content.startswith(b'%PDF'))
+
+    @override_settings(CERTIFICATE_PDF_WORKERS=1)
+    def test_pdf_rendered_in_process_pool(self):
+        """Prueba que el PDF se renderiza en un proceso aparte del pool."""
+        self.addCleanup(self._shutdown_pdf_pool)
+        certificate = create_certificate(user=self.user)
+
+        with patch(
+            'certificates.services._render_pdf_from_data',
+            _render_reporting_pid,
+        ):
+            res = self.client.get(pdf_url(certificate.id))
+            content = res.content
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(services._PDF_POOL)
+        worker_pid = int(content.removeprefix(b'%PDF-'))
+        self.assertNotEqual(worker_pid, os.getpid())
+
+    @staticmethod
+    def _shutdown_pdf_pool():
+        if services._PDF_POOL is not None:
+            services._PDF_POOL.shutdown()
+            services._PDF_POOL = None
+
+    @override_settings(CERTIFICATE_PDF_WORKERS=1)
+    def test_broken_pdf_pool_is_discarded(self):
+        """Prueba que un pool roto se descarta y el PDF se genera igual."""
+        self.addCleanup(self._shutdown_pdf_pool)
+        certificate = create_certificate(user=self.user)
+        broken_pool = MagicMock()
+        broken_pool.submit.side_effect = BrokenProcessPool()
+        services._PDF_POOL = broken_pool
+
+        pdf_bytes, _ = services.generate_certificate_pdf_bytes(certificate)
+
+        self.assertTrue(pdf_bytes.startswith(b'%PDF'))
+        self.assertIsNone(services._PDF_POOL)
+        broken_pool.shutdown.assert_called_once()
+
+    @override_settings(CERTIFICATE_PDF_WORKERS=1, CERTIFICATE_PDF_TIMEOUT=0.01)
+    def test_pdf_pool_wait_is_bounded(self):
+        """Prueba que la espera por el pool tiene límite (responde 503)."""
+        self.addCleanup(self._shutdown_pdf_pool)
+        certificate = create_certificate(user=self.user)
+        stuck_pool = MagicMock()
+        stuck_pool.submit.return_value = Future()
+        services._PDF_POOL = stuck_pool
+
+        res = self.client.get(pdf_url(certificate.id))
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_pdf_accepts_pdf_only_clients(self):
+        """Prueba que un cliente que solo acepta PDF recibe el PDF."""
+        certificate = create_certificate(user=self.user)
+
+        res = self.client.get(
+            pdf_url(certificate.id), HTTP_ACCEPT='application/pdf'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/pdf')
+
+    def test_pdf_of_other_user_not_found(self):
+        """Prueba que el PDF de otro usuario retorna 404 en JSON."""
+        other_user = get_user_model().objects.create_user(
+            email='other@example.com',
+            password='testpass',
+        )
+        certificate = create_certificate(user=other_user)
+
+        res = self.client.get(pdf_url(certificate.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIn('detail', res.json())
+
+    def test_pdf_download_forces_attachment(self):
+        """Prueba que ?download=1 fuerza la descarga del PDF."""
+        certificate = create_certificate(user=self.user)
+
+        res = self.client.get(pdf_url(certificate.id), {'download': 1})
+
+        self.assertEqual(
+            res['Content-Disposition'],
+            f'attachment; filename="certificate_{certificate.id}.pdf"',
+        )
+
+    def test_pdf_not_modified_with_matching_etag(self):
+        """Prueba que el PDF responde 304 si el cliente tiene esa versión."""
+        certificate = create_certificate(user=self.user)
+        res = self.client.get(pdf_url(certificate.id))
+        etag = res['ETag']
+
+        with patch('certificates.views.get_certificate_pdf_bytes') as mock_get:
+            res = self.client.get(
+                pdf_url(certificate.id), HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        mock_get.assert_not_called()
+
+        certificate.status = Certificate.Status.REVOKED
+        certificate.save()
+        res = self.client.get(
+            pdf_url(certificate.id), HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_pdf_etag_changes_when_user_renamed(self):
+        """Prueba que renombrar al usuario invalida el ETag del PDF."""
+        certificate = create_certificate(user=self.user)
+        etag = self.client.get(pdf_url(certificate.id))['ETag']
+
+        self.user.name = 'Nombre Nuevo'
+        self.user.save()
+        res = self.client.get(
+            pdf_url(certificate.id), HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_pdf_is_cached_between_requests(self):
+        """Prueba que el PDF se renderiza una sola vez mientras no cambie."""
+        certificate = create_certificate(user=self.user)
+
+        with patch(
+            'certificates.services.generate_certificate_pdf_bytes',
+            return_value=(b'%PDF-fake', 'certificate.pdf'),
+        ) as mock_generate:
+            self.client.get(pdf_url(certificate.id))
+            self.client.get(pdf_url(certificate.id))
+            self.assertEqual(mock_generate.call_count, 1)
+
+            certificate.title = 'Título editado'
+            certificate.save()
+            self.client.get(pdf_url(certificate.id))
+            self.assertEqual(mock_generate.call_count, 2)
+
+    def test_model_pdf_bytes_uses_cache(self):
+        """Prueba que Certificate.pdf_bytes() reutiliza el PDF en caché."""
+        certificate = create_certificate(user=self.user)
+
+        with patch(
+            'certificates.services.generate_certificate_pdf_bytes',
+            return_value=(b'%PDF-fake', 'certificate.pdf'),
+        ) as mock_generate:
+            certificate.pdf_bytes()
+            pdf_bytes, _ = certificate.pdf_bytes()
+
+        self.assertEqual(pdf_bytes, b'%PDF-fake')
+        self.assertEqual(mock_generate.call_count, 1)
+
+    def test_model_pdf_bytes_cache_invalidated_by_user_rename(self):
+        """Prueba que renombrar al usuario invalida el PDF en caché."""
+        certificate = create_certificate(user=self.user)
+
+        with patch(
+            'certificates.services.generate_certificate_pdf_bytes',
+            return_value=(b'%PDF-fake', 'certificate.pdf'),
+        ) as mock_generate:
+            certificate.pdf_bytes()
+            self.user.name = 'Nombre Nuevo'
+            self.user.save()
+            certificate.user.refresh_from_db()
+            certificate.pdf_bytes()
+
+        self.assertEqual(mock_generate.call_count, 2)
+
+    def test_send_email_without_broker_sends_immediately(self):
+        """Prueba que sin broker de Celery el correo se envía al instante."""
+        certificate = create_certificate(user=self.user)
+        url = send_email_url(certificate.id)
+
+        res = self.client.post(url, {'email': 'dest@example.com'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['dest@example.com'])
+
+    def test_send_email_without_broker_reports_failure(self):
+        """Prueba que un error de envío sin broker responde 503."""
+        certificate = create_certificate(user=self.user)
+        url = send_email_url(certificate.id)
+
+        with patch(
+            'certificates.views.send_certificate_email',
+            side_effect=ConnectionRefusedError('SMTP caído'),
+        ):
+            res = self.client.post(url, {'email': 'dest@example.com'})
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    @override_settings(CELERY_BROKER_URL='redis://localhost:6379/0')
+    def test_send_email_is_queued(self):
+        """Prueba que con broker el envío se encola y responde 202."""
+        certificate = create_certificate(user=self.user)
+        url = send_email_url(certificate.id)
+
+        with patch(
+            'certificates.views.send_certificate_email_task.delay'
+        ) as mock_delay:
+            res = self.client.post(url, {'email': 'dest@example.com'})
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        mock_delay.assert_called_once_with(certificate.id, 'dest@example.com')
+
+    def test_send_email_rejects_invalid_address(self):
+        """Prueba que un email inválido se rechaza antes de encolar."""
+        certificate = create_certificate(user=self.user)
+        url = send_email_url(certificate.id)
+
+        with patch(
+            'certificates.views.send_certificate_email_task.delay'
+        ) as mock_delay:
+            res = self.client.post(url, {'email': 'no-es-un-email'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', res.data)
+        mock_delay.assert_not_called()
+
+    def test_send_emails_batch_uses_single_connection(self):
+        """Prueba que el envío por lotes reutiliza una sola conexión."""
+        first = create_certificate(user=self.user)
+        second = create_certificate(user=self.user, title='Otro certificado')
+
+        with patch(
+            'certificates.services.get_connection', wraps=get_connection
+        ) as mock_conn:
+            send_certificate_emails_batch_task(
+                [(first.id, 'a@example.com'), (second.id, 'b@example.com')]
+            )
+
+        self.assertEqual(mock_conn.call_count, 1)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[1].to, ['b@example.com'])
@@ -1,18 +1,42 @@
 """
 Vistas para la API de certificados.
 """
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
 from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.utils.http import content_disposition_header
+from django.views.decorators.http import etag
 from rest_framework import viewsets, permissions, status
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.renderers import BaseRenderer
+from rest_framework.negotiation import BaseContentNegotiation
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from drf_spectacular.types import OpenApiTypes
 
 from core.models import Certificate
-from .serializers import CertificateSerializer, CertificateDetailSerializer
-from .services import generate_certificate_pdf_bytes, send_certificate_email
+from .pagination import CertificatePagination, certificate_count_cache_key
+from .serializers import (
+    CertificateSerializer,
+    CertificateListSerializer,
+    CertificateDetailSerializer,
+    SendEmailSerializer,
+)
+from .services import get_certificate_pdf_bytes, send_certificate_email
+from .tasks import send_certificate_email_task
+
+
+# Columnas que necesita CertificateListSerializer (sin description/pdf_file).
+LIST_FIELDS = (
+    'id', 'title', 'issued_at', 'expires_at', 'status', 'created_at',
+    'user__email',
+)
+
+# Máximo de certificados por petición en bulk-request (se valida al inicio).
+BULK_REQUEST_MAX_ITEMS = 100
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -32,13 +56,33 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         return obj.user_id == getattr(request.user, 'id', None)
 
 
-class PassthroughRenderer(BaseRenderer):
-    """Renderer que pasa el contenido binario sin modificarlo."""
-    media_type = 'application/pdf'
-    format = 'pdf'
+def _certificate_pdf_etag(request, pk=None):
+    """ETag del PDF: cambia con el certificado o con los datos del usuario."""
+    row = (
+        Certificate.objects
+        .filter(pk=pk, user_id=getattr(request.user, 'id', None))
+        .values_list(
+            'updated_at', 'issued_at', 'status', 'user__name', 'user__email'
+        )
+        .first()
+    )
+    if row is None:
+        return None
+    return hashlib.md5(repr(row).encode(), usedforsecurity=False).hexdigest()
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """Negociación que ignora el header Accept del cliente.
+
+    El PDF se devuelve como respuesta Django ya construida (DRF no la
+    renderiza); solo las respuestas de error pasan por el primer renderer.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
 
-    def render(self, data, accepted_media_type=None, renderer_context=None):
-        return data
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
 
 
 @extend_schema(tags=['Certificates'])
@@ -48,26 +92,87 @@ class CertificateViewSet(viewsets.ModelViewSet):
     serializer_class = CertificateSerializer
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsOwnerOrReadOnly]
+    pagination_class = CertificatePagination
 
     def get_queryset(self):
+        # DRF puede invocar get_queryset varias veces en un mismo request
+        # (permisos, filtros, paginación): se construye una sola vez.
+        if hasattr(self, '_cached_queryset'):
+            return self._cached_queryset
+
+        # HEAD no se omite: debe responder el mismo estado y headers que GET
+        # (404 si el certificado no es del usuario, ETag, paginación), y eso
+        # requiere consultar. OPTIONS y el esquema no dependen de los datos.
         user = getattr(self.request, 'user', None)
-        if user and user.is_authenticated:
-            return Certificate.objects.filter(user=user).order_by('-issued_at', '-created_at')
-        return Certificate.objects.none()
+        if (
+            getattr(self, 'swagger_fake_view', False)
+            or self.request.method == 'OPTIONS'
+            or not (user and user.is_authenticated)
+        ):
+            queryset = Certificate.objects.none()
+        else:
+            queryset = (
+                Certificate.objects.select_related('user')
+                .filter(user=user)
+                .order_by('-issued_at', '-created_at')
+            )
+            if self.action == 'list':
+                queryset = queryset.only(*LIST_FIELDS)
+        self._cached_queryset = queryset
+        return queryset
 
     def get_serializer_class(self):
+        if self.action == 'list':
+            return CertificateListSerializer
         if self.action in ('retrieve',):
             return CertificateDetailSerializer
         return CertificateSerializer
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+        cache.delete(certificate_count_cache_key(self.request.user.id))
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        cache.delete(certificate_count_cache_key(instance.user_id))
+
+    @extend_schema(
+        request=CertificateSerializer(many=True),
+        responses={201: CertificateSerializer(many=True)},
+        description=(
+            f'Crea hasta {BULK_REQUEST_MAX_ITEMS} certificados por petición.'
+        ),
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-request')
+    def bulk_request(self, request):
+        """Crear varios certificados del usuario en un solo bulk_create."""
+        serializer = CertificateSerializer(
+            data=request.data, many=True, max_length=BULK_REQUEST_MAX_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        certificates = Certificate.objects.bulk_create(
+            [
+                Certificate(user=request.user, **data)
+                for data in serializer.validated_data
+            ],
+        )
+        cache.delete(certificate_count_cache_key(request.user.id))
+        return Response(
+            CertificateSerializer(certificates, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
 
-    @action(detail=True, methods=['get'], url_path='pdf', renderer_classes=[PassthroughRenderer])
     @extend_schema(
-        responses={200: (OpenApiTypes.BINARY, 'application/pdf')},
+        responses={(200, 'application/pdf'): OpenApiTypes.BINARY},
         description='Genera el PDF en memoria y lo devuelve como application/pdf. Usa ?download=1 para forzar descarga.'
     )
+    @action(
+        detail=True,
+        methods=['get'],
+        url_path='pdf',
+        content_negotiation_class=IgnoreClientContentNegotiation,
+    )
+    @method_decorator(etag(_certificate_pdf_etag))
     def pdf(self, request, pk=None):
         """Descargar o visualizar el PDF del certificado (on-demand).
 
@@ -75,7 +180,7 @@ class CertificateViewSet(viewsets.ModelViewSet):
         """
         certificate = self.get_object()
         try:
-            pdf_bytes, file_name = generate_certificate_pdf_bytes(certificate)
+            pdf_bytes, file_name = get_certificate_pdf_bytes(certificate)
         except Exception as exc:
             return Response(
                 {
@@ -84,27 +189,58 @@ class CertificateViewSet(viewsets.ModelViewSet):
                 },
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
+        # Los bytes ya están completos en memoria (y en caché): se envían de
+        # una vez; Django arma Content-Disposition y escapa el nombre.
         resp = HttpResponse(pdf_bytes, content_type='application/pdf')
-        disposition = 'attachment' if request.query_params.get('download') else 'inline'
-        resp['Content-Disposition'] = f"{disposition}; filename=\"{file_name}\""
+        resp['Content-Disposition'] = content_disposition_header(
+            bool(request.query_params.get('download')), file_name
+        )
         return resp
 
-    @extend_schema(request={'type': 'object', 'properties': {'email': {'type': 'string'}}})
+    @extend_schema(request=SendEmailSerializer)
     @action(detail=True, methods=['post'], url_path='send-email')
     def send_email(self, request, pk=None):
-        """Enviar el PDF del certificado por email (generado en memoria)."""
+        """Enviar el PDF del certificado por email (generado en memoria).
+
+        Con un broker de Celery configurado el envío se encola (202); sin él se
+        envía en la misma petición, como antes.
+        """
         certificate = self.get_object()
-        to_email = request.data.get('email')
-        if not to_email:
-            return Response({'detail': 'Falta el campo email.'}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = SendEmailSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        to_email = serializer.validated_data['email']
+
+        if not settings.CELERY_BROKER_URL:
+            try:
+                send_certificate_email(certificate, to_email)
+            except Exception as exc:
+                return Response(
+                    {
+                        'detail': (
+                            'No se pudo enviar el correo con el PDF. Revisa '
+                            'las dependencias de WeasyPrint y la '
+                            'configuración de email.'
+                        ),
+                        'error': str(exc),
+                    },
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
+            return Response({'detail': 'Correo enviado.'})
+
         try:
-            send_certificate_email(certificate, to_email)
+            send_certificate_email_task.delay(certificate.id, to_email)
         except Exception as exc:
             return Response(
                 {
-                    'detail': 'No se pudo enviar el correo con el PDF. Revisa las dependencias de WeasyPrint y la configuración de email.',
+                    'detail': (
+                        'No se pudo encolar el envío del correo. Revisa la '
+                        'configuración de Celery.'
+                    ),
                     'error': str(exc),
                 },
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
-        return Response({'detail': 'Correo enviado.'})
+        return Response(
+            {'detail': 'Correo en cola de envío.'},
+            status=status.HTTP_202_ACCEPTED,
+        )
@@ -41,4 +41,4 @@ admin.site.register(models.User, UserAdmin)
 admin.site.register(models.Event)
 admin.site.register(models.News)
 admin.site.register(models.Facility)
-admin.site.register(models.Certificate)
+admin.site.register(models.Certificate, list_select_related=['user'])
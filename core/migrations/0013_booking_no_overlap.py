@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:55
+
+import core.constraints
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_certificate_updated_at'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=core.constraints.PostgresExclusionConstraint(condition=models.Q(('status__in', ['confirmed', 'pending'])), expressions=[('facility', '='), (core.constraints.TsTzRange('start_at', 'end_at'), '&&')], name='booking_no_overlap', violation_error_message='La instalación ya está reservada en el horario solicitado.'),
+        ),
+    ]
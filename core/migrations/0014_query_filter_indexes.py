@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_booking_no_overlap'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['user', '-issued_at', '-created_at'], name='certificate_user_issued_i'),
+        ),
+    ]
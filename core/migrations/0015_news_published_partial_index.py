@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_query_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('published', True)), fields=['-id'], name='news_published_id_i'),
+        ),
+    ]
@@ -1,13 +1,20 @@
 """
 Modelos de la base datos.
 """
+from functools import lru_cache
+
 from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.contrib.postgres.fields import RangeOperators
 from django.core.exceptions import ValidationError
-from django.db.models import F, Q
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Concat
 from django.utils import timezone
 
+from core.constraints import PostgresExclusionConstraint, TsTzRange
+
 
 class UserManager(BaseUserManager):
     """Manager para usuarios."""
@@ -18,7 +25,7 @@ class UserManager(BaseUserManager):
             raise ValueError('El usuario debe tener un email')
         normalized_email = self.normalize_email(email)
         role = extra_fields.get('role', self.model.Role.REGISTERED)
-        if role not in self.model.Role.values:
+        if role not in _ROLE_VALUES:
             raise ValueError('El rol especificado no es valido')
         extra_fields['role'] = role
 
@@ -37,6 +44,7 @@ class UserManager(BaseUserManager):
 
         return user
 
+
 class User(AbstractBaseUser, PermissionsMixin):
     """Usuario en el sistema."""
     class Role(models.TextChoices):
@@ -61,16 +69,22 @@ class User(AbstractBaseUser, PermissionsMixin):
     @property
     def is_member(self):
         """Retorna True si el usuario posee acceso de miembro."""
-        if getattr(self, 'is_superuser', False):
-            return True
-        return self.role in {self.Role.MEMBER, self.Role.ADMIN}
+        return (
+            getattr(self, 'is_superuser', False) or self.role in _MEMBER_ROLES
+        )
 
     @property
     def is_admin(self):
         """Retorna True si el usuario posee rol administrativo."""
-        if getattr(self, 'is_superuser', False):
-            return True
-        return self.role == self.Role.ADMIN
+        return (
+            getattr(self, 'is_superuser', False)
+            or self.role == self.Role.ADMIN
+        )
+
+
+_ROLE_VALUES = frozenset(User.Role.values)
+_MEMBER_ROLES = frozenset({User.Role.MEMBER.value, User.Role.ADMIN.value})
+
 
 class Application(models.Model):
     """Modelo de Solicitud de ascenso de rol a 'Miembro'."""
@@ -110,21 +124,42 @@ class Application(models.Model):
     def __str__(self):
         return f"Membership Request (user={self.user.email}, status={self.status})"
 
-    def approve(self, reviewer):
-        """Marcar la solicitud como aprobada y asignar rol MEMBER al usuario."""
+    @classmethod
+    def bulk_approve(cls, qs, reviewer, reviewed_at=None):
+        """Aprobar las solicitudes de `qs` y ascender a sus usuarios a MEMBER.
+
+        Ejecuta exactamente dos UPDATE sin importar el tamaño del lote.
+        """
 
         if not getattr(reviewer, 'is_admin', False):
             raise PermissionError('Only admins can approve membership requests')
 
+        with transaction.atomic():
+            # Primero los usuarios: `qs` puede filtrar por estado y dejar
+            # de coincidir después de actualizar las solicitudes.
+            User.objects.filter(pk__in=qs.values('user_id')).update(
+                role=User.Role.MEMBER
+            )
+            return qs.update(
+                status=cls.Status.APPROVED,
+                reviewed_by=reviewer,
+                reviewed_at=reviewed_at or timezone.now(),
+            )
+
+    def approve(self, reviewer):
+        """Marcar la solicitud como aprobada y asignar rol MEMBER al usuario."""
+
+        reviewed_at = timezone.now()
+        self.bulk_approve(
+            Application.objects.filter(pk=self.pk), reviewer, reviewed_at
+        )
+
+        # Reflejar los cambios en las instancias ya cargadas
         self.status = self.Status.APPROVED
         self.reviewed_by = reviewer
-        self.reviewed_at = timezone.now()
-        self.save()
-
-        # Cambiar rol del usuario
-        user = self.user
-        user.role = user.Role.MEMBER
-        user.save(update_fields=['role'])
+        self.reviewed_at = reviewed_at
+        if Application.user.is_cached(self):
+            self.user.role = User.Role.MEMBER
 
     def reject(self, reviewer, note=''):
         """Marcar la solicitud como rechazada."""
@@ -132,12 +167,18 @@ class Application(models.Model):
         if not getattr(reviewer, 'is_admin', False):
             raise PermissionError('Only admins can reject membership requests')
 
-        self.status = self.Status.REJECTED
-        self.reviewed_by = reviewer
-        self.reviewed_at = timezone.now()
+        changes = {
+            'status': self.Status.REJECTED,
+            'reviewed_by': reviewer,
+            'reviewed_at': timezone.now(),
+        }
         if note:
-            self.admin_note = note
-        self.save()
+            changes['admin_note'] = note
+        Application.objects.filter(pk=self.pk).update(**changes)
+
+        # Reflejar los cambios en la instancia ya cargada
+        for field, value in changes.items():
+            setattr(self, field, value)
 
 
 class Facility(models.Model):
@@ -212,6 +253,13 @@ class Event(models.Model):
         return self.capacity is not None
 
 
+# Estados que ocupan la instalación (usados por la restricción de solapamiento)
+_BOOKING_ACTIVE_STATUSES = ['confirmed', 'pending']
+_BOOKING_OVERLAP_MESSAGE = (
+    'La instalación ya está reservada en el horario solicitado.'
+)
+
+
 class Booking(models.Model):
     """Reserva de una instalación para un bloque de tiempo."""
 
@@ -255,6 +303,17 @@ class Booking(models.Model):
                 check=Q(end_at__gt=F('start_at')),
                 name='booking_end_after_start',
             ),
+            # La base de datos impide reservas vigentes solapadas en la misma
+            # instalación. Solo en PostgreSQL: otros motores no la verifican.
+            PostgresExclusionConstraint(
+                name='booking_no_overlap',
+                expressions=[
+                    ('facility', RangeOperators.EQUAL),
+                    (TsTzRange('start_at', 'end_at'), RangeOperators.OVERLAPS),
+                ],
+                condition=Q(status__in=_BOOKING_ACTIVE_STATUSES),
+                violation_error_message=_BOOKING_OVERLAP_MESSAGE,
+            ),
         ]
 
     def __str__(self):
@@ -265,29 +324,62 @@ class Booking(models.Model):
         if self.end_at <= self.start_at:
             raise ValidationError('La hora de término debe ser posterior al inicio.')
 
-        if self.status == self.Status.CANCELLED:
-            return
+    def save(self, *args, **kwargs):
+        """Guardar traduciendo el solapamiento detectado por la base de datos.
 
-        overlap_qs = Booking.objects.filter(
-            facility=self.facility,
-            status__in=[self.Status.CONFIRMED, self.Status.PENDING],
-        ).exclude(pk=self.pk).filter(
-            Q(start_at__lt=self.end_at) &
-            Q(end_at__gt=self.start_at)
-        )
-
-        if overlap_qs.exists():
-            raise ValidationError('La instalación ya está reservada en el horario solicitado.')
+        El savepoint deja usable la transacción externa tras el rechazo.
+        """
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except IntegrityError as exc:
+            diag = getattr(exc.__cause__, 'diag', None)
+            if getattr(diag, 'constraint_name', None) == 'booking_no_overlap':
+                raise ValidationError(_BOOKING_OVERLAP_MESSAGE) from exc
+            raise
+
+    @staticmethod
+    def _cancel_note(by_user=None, reason=''):
+        """Construir la nota de cancelación que se agrega a `notes`."""
+        parts = []
+        if reason:
+            parts.append(f'Cancelado: {reason}')
+        if by_user:
+            parts.append(f'Acción por: {by_user.email}')
+        return '\n'.join(parts)
 
     def cancel(self, by_user=None, reason=''):
         """Cancelar la reserva."""
         self.status = self.Status.CANCELLED
-        if reason:
-            self.notes = f'{self.notes}\nCancelado: {reason}' if self.notes else f'Cancelado: {reason}'
-        if by_user:
-            self.notes = f'{self.notes}\nAcción por: {by_user.email}' if self.notes else f'Acción por: {by_user.email}'
+        note = self._cancel_note(by_user, reason)
+        if note:
+            self.notes = f'{self.notes}\n{note}' if self.notes else note
         self.save(update_fields=['status', 'notes', 'updated_at'])
 
+    @classmethod
+    def bulk_cancel(cls, qs, by_user=None, reason=''):
+        """Cancelar todas las reservas de `qs` en un solo UPDATE."""
+        changes = {
+            'status': cls.Status.CANCELLED,
+            'updated_at': timezone.now(),
+        }
+        note = cls._cancel_note(by_user, reason)
+        if note:
+            changes['notes'] = Case(
+                When(notes='', then=Value(note)),
+                default=Concat(F('notes'), Value(f'\n{note}')),
+                output_field=models.TextField(),
+            )
+        return qs.update(**changes)
+
+
+class NewsQuerySet(models.QuerySet):
+    """QuerySet de noticias; `with_related()` precarga el autor en listados."""
+
+    def with_related(self):
+        return self.select_related('author')
+
+
 class News(models.Model):
     """Modelo de Noticia."""
     author = models.ForeignKey(
@@ -299,6 +391,18 @@ class News(models.Model):
     published = models.BooleanField(default=False)
     link = models.URLField(max_length=200, blank=True)
 
+    objects = NewsQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Parcial: el listado público solo consulta noticias publicadas
+            models.Index(
+                fields=['-id'],
+                condition=Q(published=True),
+                name='news_published_id_i',
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -320,6 +424,19 @@ class Project(models.Model):
         return self.name
 
 
+@lru_cache(maxsize=1)
+def _get_pdf_generator():
+    """Resolver una sola vez el generador de PDF.
+
+    Import diferido: core no depende de certificates al cargar los modelos.
+    """
+    try:
+        from certificates.services import get_certificate_pdf_bytes
+    except ImportError:
+        raise RuntimeError('Servicio de generación de PDF no disponible.')
+    return get_certificate_pdf_bytes
+
+
 class Certificate(models.Model):
     """Modelo de Certificado emitido para un usuario.
 
@@ -347,12 +464,20 @@ class Certificate(models.Model):
         default=Status.ACTIVE,
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     # Campos legacy para potencial almacenamiento futuro (no usados en on-demand):
     pdf_file = models.FileField(upload_to='certificates/', blank=True, null=True)
     pdf_generated_at = models.DateTimeField(blank=True, null=True)
 
     class Meta:
         ordering = ['-issued_at', '-created_at']
+        indexes = [
+            # Listado por usuario de CertificateViewSet (orden por defecto)
+            models.Index(
+                fields=['user', '-issued_at', '-created_at'],
+                name='certificate_user_issued_i',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.user.email}"
@@ -360,14 +485,10 @@ class Certificate(models.Model):
     def pdf_bytes(self) -> tuple[bytes, str]:
         """Renderizar el PDF en memoria y retornar (bytes, file_name).
 
-        Implementación on-demand: no se persiste en disco ni en FileField.
+        Implementación on-demand: no se persiste en disco ni en FileField, pero
+        se reutiliza el PDF en caché mientras el certificado no cambie.
         """
-        try:
-            from certificates.services import generate_certificate_pdf_bytes
-        except ImportError:
-            raise RuntimeError('Servicio de generación de PDF no disponible.')
-
-        return generate_certificate_pdf_bytes(self)
+        return _get_pdf_generator()(self)
 
     def generate_pdf(self, force=False):
         """[DEPRECADO] Mantenido por compatibilidad. Genera el PDF en memoria.
@@ -31,7 +31,8 @@ class IsOwnerOrAdmin(permissions.BasePermission):
 
     Implementa `has_object_permission` para controlar acceso a nivel de objeto
     (por ejemplo: editar o eliminar recursos). Si el objeto tiene un campo
-    `user` que representa su propietario, se compara con `request.user`.
+    `user` que representa su propietario, se compara su id con el del usuario
+    autenticado (`request.user.id`).
     """
 
     message = 'Se requiere ser el propietario del recurso o administrador.'
@@ -44,6 +45,6 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         if getattr(request.user, 'is_admin', False):
             return True
 
-        # Si el objeto tiene atributo `user`, comparar.
-        owner = getattr(obj, 'user', None)
-        return owner == request.user
+        # Comparar el id del FK `user` evita cargar el propietario desde la BD.
+        owner_id = getattr(obj, 'user_id', None)
+        return owner_id is not None and owner_id == request.user.id
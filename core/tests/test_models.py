@@ -1,10 +1,15 @@
 """
 Tests para Models.
 """
-from decimal import Decimal
 from datetime import timedelta
+from types import SimpleNamespace
+from unittest import skipUnless
+from unittest.mock import patch
 
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 from core import models
@@ -83,3 +88,283 @@ class ModelTests(TestCase):
             published=True,
         )
         self.assertEqual(str(news), news.title)
+
+    @skipUnless(
+        connection.vendor == 'postgresql',
+        'Requiere ExclusionConstraint de PostgreSQL',
+    )
+    def test_booking_overlap_raises_error(self):
+        """Test que una reserva solapada en la misma instalación se rechaza."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='Testpass123'
+        )
+        facility = models.Facility.objects.create(
+            user=user, name='Sede', address='Calle 1', capacity=20
+        )
+        start = timezone.now() + timedelta(days=1)
+        models.Booking.objects.create(
+            facility=facility, created_by=user,
+            start_at=start, end_at=start + timedelta(hours=2),
+        )
+        overlapping = models.Booking(
+            facility=facility, created_by=user,
+            start_at=start + timedelta(hours=1),
+            end_at=start + timedelta(hours=3),
+        )
+        with self.assertRaises(ValidationError):
+            overlapping.full_clean()
+
+        contiguous = models.Booking(
+            facility=facility, created_by=user,
+            start_at=start + timedelta(hours=2),
+            end_at=start + timedelta(hours=3),
+        )
+        contiguous.full_clean()
+
+        with self.assertRaises(ValidationError):
+            overlapping.save()
+
+        # La transacción del test sigue usable tras el rechazo.
+        self.assertEqual(models.Booking.objects.count(), 1)
+
+    def test_booking_save_translates_overlap_constraint(self):
+        """Test que violar booking_no_overlap se traduce a ValidationError."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='Testpass123'
+        )
+        facility = models.Facility.objects.create(
+            user=user, name='Sede', address='Calle 1', capacity=20
+        )
+        start = timezone.now() + timedelta(days=1)
+        booking = models.Booking(
+            facility=facility, created_by=user,
+            start_at=start, end_at=start + timedelta(hours=1),
+        )
+        # Simula el error de psycopg al violar la restricción en PostgreSQL
+        error = IntegrityError('violates exclusion constraint')
+        error.__cause__ = Exception()
+        error.__cause__.diag = SimpleNamespace(
+            constraint_name='booking_no_overlap'
+        )
+
+        with patch('django.db.models.Model.save', side_effect=error):
+            with self.assertRaises(ValidationError):
+                booking.save()
+
+        other_error = IntegrityError('otra restricción')
+        with patch('django.db.models.Model.save', side_effect=other_error):
+            with self.assertRaises(IntegrityError):
+                booking.save()
+
+        self.assertFalse(models.Booking.objects.exists())
+
+    def test_application_bulk_approve(self):
+        """Test aprobar en lote asciende a los usuarios con dos UPDATE."""
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'Testpass123'
+        )
+        applicants = [
+            get_user_model().objects.create_user(
+                email=f'user{i}@example.com', password='Testpass123'
+            )
+            for i in range(3)
+        ]
+        for applicant in applicants:
+            models.Application.objects.create(user=applicant)
+
+        pending = models.Application.objects.filter(
+            status=models.Application.Status.PENDING
+        )
+        with self.assertNumQueries(4):  # SAVEPOINT + 2 UPDATE + RELEASE
+            updated = models.Application.bulk_approve(pending, admin)
+
+        self.assertEqual(updated, 3)
+        self.assertFalse(pending.exists())
+        for applicant in applicants:
+            applicant.refresh_from_db()
+            self.assertEqual(applicant.role, get_user_model().Role.MEMBER)
+
+    def test_application_approve_requires_admin(self):
+        """Test que solo un administrador puede aprobar una solicitud."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='Testpass123'
+        )
+        application = models.Application.objects.create(user=user)
+
+        with self.assertRaises(PermissionError):
+            application.approve(user)
+
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'Testpass123'
+        )
+        application.approve(admin)
+
+        self.assertEqual(
+            application.status, models.Application.Status.APPROVED
+        )
+        self.assertEqual(application.user.role, get_user_model().Role.MEMBER)
+        application.refresh_from_db()
+        self.assertEqual(application.reviewed_by, admin)
+
+    def test_user_role_flags_refresh_after_role_change(self):
+        """Test que is_member se recalcula al recargar el usuario."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='Testpass123'
+        )
+        self.assertFalse(user.is_member)
+
+        get_user_model().objects.filter(pk=user.pk).update(
+            role=get_user_model().Role.MEMBER
+        )
+        user.refresh_from_db()
+
+        self.assertTrue(user.is_member)
+        self.assertFalse(user.is_admin)
+
+    def test_user_role_flags_refresh_after_assignment(self):
+        """Test que is_member/is_admin reflejan role/is_superuser asignados."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='Testpass123'
+        )
+        self.assertFalse(user.is_member)
+        self.assertFalse(user.is_admin)
+
+        user.role = get_user_model().Role.MEMBER
+        user.save()
+        self.assertTrue(user.is_member)
+        self.assertFalse(user.is_admin)
+
+        user.is_superuser = True
+        self.assertTrue(user.is_admin)
+
+    def test_create_superuser_is_admin(self):
+        """Test que el superusuario recién creado es administrador."""
+        user = get_user_model().objects.create_superuser(
+            'admin@example.com', 'Testpass123'
+        )
+
+        self.assertTrue(user.is_admin)
+        self.assertTrue(user.is_member)
+
+    def test_news_with_related_selects_author(self):
+        """Test que listar noticias con with_related() no consulta autores."""
+        for i in range(3):
+            user = get_user_model().objects.create_user(
+                email=f'user{i}@example.com', password='Testpass123'
+            )
+            models.News.objects.create(title=f'Noticia {i}', author=user)
+
+        with self.assertNumQueries(1):
+            authors = [
+                news.author.email
+                for news in models.News.objects.with_related()
+            ]
+
+        self.assertEqual(len(authors), 3)
+
+    def test_news_default_and_reverse_managers_do_not_join(self):
+        """Test que el manager por defecto y el inverso no agregan JOIN."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='Testpass123'
+        )
+        models.News.objects.create(title='Noticia', author=user)
+
+        self.assertNotIn('JOIN', str(user.news_set.all().query))
+        self.assertEqual(
+            [news.title for news in models.News.objects.only('title')],
+            ['Noticia'],
+        )
+        self.assertIn('JOIN', str(user.news_set.with_related().query))
+
+    def test_application_reject_updates_review_fields(self):
+        """Test rechazar una solicitud guarda solo los campos de revisión."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='Testpass123'
+        )
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'Testpass123'
+        )
+        application = models.Application.objects.create(
+            user=user, message='Hola'
+        )
+
+        application.message = 'No persistido'
+        application.reject(admin, note='Faltan datos')
+        application.refresh_from_db()
+
+        self.assertEqual(
+            application.status, models.Application.Status.REJECTED
+        )
+        self.assertEqual(application.admin_note, 'Faltan datos')
+        self.assertEqual(application.message, 'Hola')
+        self.assertEqual(user.role, get_user_model().Role.REGISTERED)
+
+    def test_booking_cancel_appends_note(self):
+        """Test cancelar una reserva agrega motivo y autor a las notas."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='Testpass123'
+        )
+        facility = models.Facility.objects.create(
+            user=user, name='Sede', address='Calle 1', capacity=20
+        )
+        start = timezone.now() + timedelta(days=1)
+        booking = models.Booking.objects.create(
+            facility=facility, created_by=user, notes='Con equipo',
+            start_at=start, end_at=start + timedelta(hours=1),
+        )
+
+        booking.cancel(user, 'Lluvia')
+
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, models.Booking.Status.CANCELLED)
+        self.assertEqual(
+            booking.notes,
+            'Con equipo\nCancelado: Lluvia\nAcción por: user@example.com',
+        )
+
+    def test_booking_bulk_cancel_appends_note(self):
+        """Test cancelar reservas en lote agrega la nota de cancelación."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='Testpass123'
+        )
+        facility = models.Facility.objects.create(
+            user=user, name='Sede', address='Calle 1', capacity=20
+        )
+        start = timezone.now() + timedelta(days=1)
+        first = models.Booking.objects.create(
+            facility=facility, created_by=user,
+            start_at=start, end_at=start + timedelta(hours=1),
+        )
+        second = models.Booking.objects.create(
+            facility=facility, created_by=user, notes='Con equipo',
+            start_at=start + timedelta(hours=1),
+            end_at=start + timedelta(hours=2),
+        )
+
+        with self.assertNumQueries(1):
+            updated = models.Booking.bulk_cancel(
+                models.Booking.objects.filter(facility=facility),
+                user,
+                'Lluvia',
+            )
+
+        self.assertEqual(updated, 2)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, models.Booking.Status.CANCELLED)
+        self.assertEqual(
+            first.notes, 'Cancelado: Lluvia\nAcción por: user@example.com'
+        )
+        self.assertEqual(
+            second.notes,
+            'Con equipo\nCancelado: Lluvia\nAcción por: user@example.com',
+        )
@@ -7,25 +7,26 @@ from rest_framework.test import APIRequestFactory, force_authenticate
 from core.permissions import IsMemberUser, IsAdminRoleUser, IsOwnerOrAdmin
 from core.models import Event
 
+import copy
 import datetime
 
 
 class PermissionsTest(TestCase):
 
-    def setUp(self):
-        self.factory = APIRequestFactory()
+    @classmethod
+    def setUpTestData(cls):
         User = get_user_model()
-        self.member = User.objects.create_user(
+        cls.member = User.objects.create_user(
             email='member@example.com', password='password', role=User.Role.MEMBER
         )
-        self.admin = User.objects.create_user(
+        cls.admin = User.objects.create_user(
             email='admin@example.com', password='password', role=User.Role.ADMIN
         )
-        self.registered = User.objects.create_user(
+        cls.registered = User.objects.create_user(
             email='registered@example.com', password='password', role=User.Role.REGISTERED
         )
-        self.event_owned_by_member = Event.objects.create(
-            user=self.member,
+        cls.event_owned_by_member = Event.objects.create(
+            user=cls.member,
             title='Member Event',
             date=datetime.date.today(),
             duration=datetime.timedelta(hours=1),
@@ -34,8 +35,8 @@ class PermissionsTest(TestCase):
             address='A1',
         )
         # another event owned by registered user
-        self.event_owned_by_reg = Event.objects.create(
-            user=self.registered,
+        cls.event_owned_by_reg = Event.objects.create(
+            user=cls.registered,
             title='Reg Event',
             date=datetime.date.today(),
             duration=datetime.timedelta(hours=2),
@@ -44,8 +45,12 @@ class PermissionsTest(TestCase):
             address='A2',
         )
 
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self._bare_request = self.factory.get('/')
+
     def _get_request(self, user):
-        request = self.factory.get('/')
+        request = copy.copy(self._bare_request)
         request.user = user
         return request
 
@@ -80,3 +85,12 @@ class PermissionsTest(TestCase):
         request_admin = self._get_request(self.admin)
         self.assertTrue(perms.has_object_permission(request_admin, None, self.event_owned_by_member))
         self.assertTrue(perms.has_object_permission(request_admin, None, self.event_owned_by_reg))
+
+    def test_is_owner_or_admin_does_not_load_owner(self):
+        perms = IsOwnerOrAdmin()
+        event = Event.objects.get(pk=self.event_owned_by_member.pk)
+        request_member = self._get_request(self.member)
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                perms.has_object_permission(request_member, None, event)
+            )
@@ -0,0 +1,15 @@
+"""
+Paginación para la API de eventos.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class EventCursorPagination(CursorPagination):
+    """Paginación por cursor (keyset) sobre la clave primaria descendente.
+
+    Cada página es un `WHERE id < cursor ... LIMIT n` servido por el índice
+    de la PK, sin OFFSET que recorra y descarte filas anteriores.
+    """
+
+    page_size = 50
+    ordering = '-id'
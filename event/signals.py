@@ -0,0 +1,39 @@
+"""
+Versión del listado de eventos, usada como ETag sin consultar la base de datos.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Event
+
+EVENT_LIST_VERSION_KEY = 'event:list:version'
+
+# Vigencia de la versión: acota cuánto puede durar un 304 obsoleto si una
+# escritura no pasa por las señales (p. ej. QuerySet.update()).
+EVENT_LIST_VERSION_TIMEOUT = 300
+
+
+def event_list_version() -> str:
+    """Retornar la versión actual del listado (se crea si no está en caché)."""
+    return cache.get_or_set(
+        EVENT_LIST_VERSION_KEY,
+        lambda: uuid.uuid4().hex,
+        EVENT_LIST_VERSION_TIMEOUT,
+    )
+
+
+def bump_event_list_version() -> None:
+    # Un token aleatorio (no un contador) evita repetir una versión ya
+    # entregada si la clave se pierde por expulsión de la caché.
+    cache.set(
+        EVENT_LIST_VERSION_KEY, uuid.uuid4().hex, EVENT_LIST_VERSION_TIMEOUT
+    )
+
+
+@receiver(post_save, sender=Event, dispatch_uid='event_list_version_on_save')
+@receiver(post_delete, sender=Event, dispatch_uid='event_list_version_on_del')
+def _invalidate_event_list(sender, **kwargs):
+    bump_event_list_version()
@@ -2,8 +2,9 @@
 Tests para la API de eventos.
 """
 from datetime import timedelta
+from unittest.mock import patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
@@ -12,11 +13,18 @@ from rest_framework.test import APIClient
 
 from core.models import Event
 
+from event.pagination import EventCursorPagination
+from event.signals import bump_event_list_version
 from event.serializers import EventSerializer
 
 
 EVENTS_URL = reverse('event:event-list')
 
+# Consultas por GET; deben ser constantes, sin N+1. El ETag de la lista sale
+# de la caché, el del detalle consulta `updated_at`.
+EXPECTED_LIST_QUERIES = 1
+EXPECTED_DETAIL_QUERIES = 2
+
 
 def detail_url(event_id):
     """Crear y retornar la URL de detalle del evento."""
@@ -67,12 +75,13 @@ class PrivateEventApiTests(TestCase):
         create_event(user=self.user)
         create_event(user=self.user, title='Otro evento')
 
-        res = self.client.get(EVENTS_URL)
+        with self.assertNumQueries(EXPECTED_LIST_QUERIES):
+            res = self.client.get(EVENTS_URL)
 
         events = Event.objects.all().order_by('-id')
         serializer = EventSerializer(events, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_event_list_limited_to_user(self):
         """Prueba que la lista de eventos está limitada al usuario autenticado."""
@@ -83,19 +92,104 @@ class PrivateEventApiTests(TestCase):
         create_event(user=other_user)
         create_event(user=self.user)
 
-        res = self.client.get(EVENTS_URL)
+        with self.assertNumQueries(EXPECTED_LIST_QUERIES):
+            res = self.client.get(EVENTS_URL)
 
         events = Event.objects.filter(user=self.user).order_by('-id')
         serializer = EventSerializer(events, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_event_list_cursor_pagination(self):
+        """Prueba que la lista se pagina por cursor (más recientes primero)."""
+        first = create_event(user=self.user)
+        second = create_event(user=self.user, title='Otro evento')
+
+        with patch.object(EventCursorPagination, 'page_size', 1):
+            res = self.client.get(EVENTS_URL)
+            ids = [e['id'] for e in res.data['results']]
+            self.assertEqual(ids, [second.id])
+            self.assertIsNone(res.data['previous'])
+
+            res = self.client.get(res.data['next'])
+            ids = [e['id'] for e in res.data['results']]
+            self.assertEqual(ids, [first.id])
+            self.assertIsNone(res.data['next'])
+
+    @override_settings(EVENT_LIST_ETAG=True)
+    def test_event_list_not_modified_with_matching_etag(self):
+        """Prueba que la lista responde 304 mientras no cambien los eventos."""
+        create_event(user=self.user)
+        res = self.client.get(EVENTS_URL)
+        etag = res['ETag']
+
+        with self.assertNumQueries(0):
+            res = self.client.get(EVENTS_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        create_event(user=self.user, title='Otro evento')
+        res = self.client.get(EVENTS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 2)
+
+    @override_settings(EVENT_LIST_ETAG=True)
+    def test_event_list_etag_changes_on_delete(self):
+        """Prueba que eliminar un evento invalida el ETag de la lista."""
+        event = create_event(user=self.user)
+        etag = self.client.get(EVENTS_URL)['ETag']
+
+        event.delete()
+        res = self.client.get(EVENTS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [])
+
+    @override_settings(EVENT_LIST_ETAG=True)
+    def test_event_list_etag_follows_version_bumped_elsewhere(self):
+        """Prueba que el ETag cambia si la versión se renueva sin señales."""
+        create_event(user=self.user)
+        etag = self.client.get(EVENTS_URL)['ETag']
+
+        # Simula una escritura hecha por otro proceso que comparte la caché
+        bump_event_list_version()
+        res = self.client.get(EVENTS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    @override_settings(EVENT_LIST_ETAG=False)
+    def test_event_list_without_shared_cache_has_no_etag(self):
+        """Prueba que sin caché compartida la lista no envía ETag."""
+        create_event(user=self.user)
+
+        res = self.client.get(EVENTS_URL, HTTP_IF_NONE_MATCH='*')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', res)
+
+    def test_event_detail_etag_changes_on_update(self):
+        """Prueba que el ETag del detalle cambia al editar el evento."""
+        event = create_event(user=self.user)
+        url = detail_url(event.id)
+        etag = self.client.get(url)['ETag']
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(url, {'title': 'Título nuevo'})
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['title'], 'Título nuevo')
 
     def test_get_event_detail(self):
         """Prueba obtener el detalle de un evento."""
         event = create_event(user=self.user)
 
         url = detail_url(event.id)
-        res = self.client.get(url)
+        with self.assertNumQueries(EXPECTED_DETAIL_QUERIES):
+            res = self.client.get(url)
 
         serializer = EventSerializer(event)
         self.assertEqual(res.data, serializer.data)
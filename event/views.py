@@ -1,13 +1,64 @@
 """
 Vistas para la API de eventos.
 """
+import hashlib
+
+from django.conf import settings
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import etag
 from rest_framework import viewsets, permissions
 from rest_framework.authentication import TokenAuthentication
 from drf_spectacular.utils import extend_schema
 
 from core.models import Event
+from .pagination import EventCursorPagination
+from .signals import event_list_version
 from .serializers import EventSerializer
 
+# Columnas que expone el serializer; el resto (estado, auditoría) no se lee
+READ_FIELDS = tuple(EventSerializer.Meta.fields)
+
+
+def _list_queryset(user):
+    """Eventos del listado: los propios si está autenticado, si no todos."""
+    if user and user.is_authenticated:
+        return Event.objects.filter(user=user)
+    return Event.objects.all()
+
+
+def _etag(*parts):
+    return hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def _event_list_etag(request):
+    """ETag del listado: cambia si se crea, edita o elimina cualquier evento.
+
+    Se basa en una versión guardada en caché (ver `event.signals`), así que
+    no consulta la base de datos. Los `QuerySet.update()` no emiten señales y
+    deben llamar a `bump_event_list_version()`. Solo se activa con una caché
+    compartida (`EVENT_LIST_ETAG`); con memoria local cada proceso tendría
+    su propia versión y respondería 304 a cambios hechos en otro.
+    """
+    if not settings.EVENT_LIST_ETAG:
+        return None
+    user = getattr(request, 'user', None)
+    return _etag(
+        request.get_full_path(), request.META.get('HTTP_ACCEPT'),
+        getattr(user, 'pk', None), event_list_version(),
+    )
+
+
+def _event_detail_etag(request, pk=None):
+    """ETag del detalle: cambia solo si el evento se edita."""
+    updated_at = (
+        Event.objects.filter(pk=pk)
+        .values_list('updated_at', flat=True)
+        .first()
+    )
+    if updated_at is None:
+        return None
+    return _etag(pk, request.META.get('HTTP_ACCEPT'), updated_at)
+
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
     """Permiso: lectura pública, escritura solo por propietario autenticado."""
@@ -32,7 +83,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             request.user
             and request.user.is_authenticated
             and request.user.is_member
-            and obj.user == request.user
+            and obj.user_id == request.user.id
         )
 
 
@@ -46,6 +97,7 @@ class EventViewSet(viewsets.ModelViewSet):
     """
     queryset = Event.objects.all().order_by('-id')
     serializer_class = EventSerializer
+    pagination_class = EventCursorPagination
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsOwnerOrReadOnly]
 
@@ -58,12 +110,24 @@ class EventViewSet(viewsets.ModelViewSet):
         user = getattr(self.request, 'user', None)
 
         # Solo filtrar por usuario en la acción 'list'
-        if self.action == 'list' and user and user.is_authenticated:
-            return Event.objects.filter(user=user).order_by('-id')
+        if self.action == 'list':
+            return _list_queryset(user).order_by('-id').only(*READ_FIELDS)
+        if self.action == 'retrieve':
+            return Event.objects.order_by('-id').only(*READ_FIELDS)
 
-        # Para retrieve, update, delete: devolver todos los eventos
+        # Para update y delete: devolver todos los eventos completos
         # Los permisos (IsOwnerOrReadOnly) manejarán el acceso apropiado
         return Event.objects.all().order_by('-id')
 
+    # GET condicional: si el cliente ya tiene la versión actual se responde 304
+    # sin consultar las filas ni serializarlas.
+    @method_decorator(etag(_event_list_etag))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @method_decorator(etag(_event_detail_etag))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
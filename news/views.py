@@ -32,7 +32,7 @@ class IsAuthorOrReadOnly(permissions.BasePermission):
 			request.user
 			and request.user.is_authenticated
 			and request.user.is_member
-			and obj.author == request.user
+			and obj.author_id == request.user.id
 		)
 
 
@@ -44,7 +44,7 @@ class NewsViewSet(viewsets.ModelViewSet):
 	- POST: usuarios autenticados
 	- PUT/PATCH/DELETE: solo autor
 	"""
-	queryset = News.objects.filter(published=True).order_by('-id')
+	queryset = News.objects.with_related().filter(published=True).order_by('-id')
 	serializer_class = NewsSerializer
 	authentication_classes = [TokenAuthentication]
 	permission_classes = [IsAuthorOrReadOnly]